@@ -11,7 +11,7 @@ Algorithmes disponibles :
 
 from importlib.metadata import PackageNotFoundError, version
 
-from .functions import create_solution, load_data
+from .functions import create_solution, load_data, parse_data
 from .main import main
 from .metaheuristics import (
     LS_Iterate as local_search,
@@ -30,6 +30,7 @@ __all__ = [
     "load_data",
     "local_search",
     "main",
+    "parse_data",
     "simulated_annealing",
     "tabu_search",
 ]
@@ -0,0 +1,226 @@
+"""Banc d'essai de passage à l'échelle pour le problème Ring Star.
+
+Ce module mesure, en fonction du nombre de nœuds N, le coût des
+différentes étapes de la résolution sur des instances synthétiques
+(voir le module `generator`) :
+
+    - temps de chargement de l'instance (`load_data`) ;
+    - temps de construction d'une solution initiale (`InitSol`) ;
+    - temps d'un parcours complet de voisinage pour chaque opérateur
+      (Inversion, Transposition, Déplacement) avec `BestNeighbor` et,
+      en option, `TabuNeighbors` (qui conserve tous les voisins en
+      mémoire, soit O(n³) entiers pour un ring de n nœuds) ;
+    - mémoire occupée par l'instance chargée et pic mémoire pendant le
+      chargement, la construction et chaque parcours de voisinage.
+
+Pour que les mesures ne dépendent que de N, la solution de départ a un
+Ring de taille fixée (la moitié des nœuds par défaut) et la durée de
+construction est la médiane de plusieurs constructions (graines
+successives). Les parcours dont la durée estimée (extrapolée depuis la
+taille précédente) dépasse le budget fixé sont ignorés et signalés comme
+tels.
+Chaque parcours est exécuté deux fois : une fois pour la durée, une fois
+sous `tracemalloc` pour le pic mémoire.
+
+Functions:
+    bench_instance: Mesure toutes les étapes sur un fichier d'instance.
+    main: Point d'entrée en ligne de commande.
+"""
+
+import argparse
+import copy
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ring_star.functions import (
+    BestNeighbor,
+    InitSol,
+    MemoryUsage,
+    TabuNeighbors,
+    load_data,
+)
+from ring_star.generator import LAYOUTS, SIZES, generate_points, write_instance
+
+OPERATORS = {1: "inversion", 2: "transposition", 3: "deplacement"}
+SCANS = {"best_neighbor": BestNeighbor, "tabu_neighbors": TabuNeighbors}
+RING_SHARE = 0.5
+REPEATS = 5
+
+
+def _measure(func, *args):
+
+    start = time.perf_counter()
+    output = func(*args)
+    return output, time.perf_counter() - start
+
+
+def _peak(func, *args):
+
+    tracemalloc.start()
+    try:
+        output = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return output, peak
+
+
+def bench_instance(
+    name,
+    budget=60.0,
+    previous=None,
+    seed=0,
+    tabu=False,
+    ring_share=RING_SHARE,
+    repeats=REPEATS,
+):
+    """Mesure les différentes étapes de la résolution sur l'instance `name`.
+
+    Les solutions construites ont un Ring de `ring_share` * N nœuds (au
+    moins 4) ; la durée de construction est la médiane de `repeats`
+    constructions, et les parcours partent de la première d'entre elles.
+
+    `previous` associe à chaque parcours de voisinage la dernière mesure
+    (taille du ring, durée) ; il sert à estimer la durée du parcours et à
+    l'ignorer si l'estimation dépasse `budget` secondes. Il est mis à jour
+    avec les nouvelles mesures. `TabuNeighbors` n'est mesuré que si
+    `tabu` est vrai. Chaque parcours mesuré est associé au couple
+    (durée, pic mémoire).
+    """
+    if previous is None:
+        previous = {}
+
+    data, load_time = _measure(load_data, name)
+    size = min(data[0], max(4, round(ring_share * data[0])))
+    sols, times = [], []
+    for k in range(repeats):
+        random.seed(seed + k)
+        sol, init_time = _measure(InitSol, data, size)
+        sols.append(sol)
+        times.append(init_time)
+    sol, init_time = sols[0], statistics.median(times)
+
+    # Le pic mémoire est mesuré à part : tracemalloc ralentit l'exécution
+    data, load_peak = _peak(load_data, name)
+    random.seed(seed)
+    _, init_peak = _peak(InitSol, data, size)
+
+    n = len(sol[0])
+    result = {
+        "N": data[0],
+        "ring": n,
+        "load_time": load_time,
+        "init_time": init_time,
+        "memory": MemoryUsage(data),
+        "load_peak": load_peak,
+        "init_peak": init_peak,
+        "scans": {},
+    }
+
+    if n <= 3:
+        return result
+
+    for scan_name, scan in SCANS.items():
+        if scan is TabuNeighbors and not tabu:
+            continue
+        for choice, op_name in OPERATORS.items():
+            key = f"{scan_name}/{op_name}"
+            estimate = 0.0
+            if key in previous:
+                # Inversion en O(n), Transposition et Déplacement en O(n³)
+                n0, t0 = previous[key]
+                estimate = t0 * (n / n0) ** (1 if choice == 1 else 3)
+            if estimate > budget:
+                result["scans"][key] = None
+                continue
+            _, scan_time = _measure(scan, data, copy.deepcopy(sol), choice)
+            _, scan_peak = _peak(scan, data, copy.deepcopy(sol), choice)
+            result["scans"][key] = (scan_time, scan_peak)
+            previous[key] = (n, scan_time)
+
+    return result
+
+
+def _report(layout, result):
+
+    mb = 1024 * 1024
+    print(f"\n--- {layout} N = {result['N']} (ring : {result['ring']} nœuds) ---")
+    print(f"  • Chargement   : {result['load_time']:.3f} s")
+    print(f"  • Construction : {result['init_time']:.4f} s")
+    print(f"  • Mémoire de l'instance      : {result['memory'] / mb:.1f} Mo")
+    print(f"  • Pic mémoire (chargement)   : {result['load_peak'] / mb:.1f} Mo")
+    print(f"  • Pic mémoire (construction) : {result['init_peak'] / mb:.1f} Mo")
+    for key, scan in result["scans"].items():
+        if scan is None:
+            print(f"  • {key} : ignoré (budget dépassé)")
+        else:
+            print(f"  • {key} : {scan[0]:.4f} s, pic mémoire {scan[1] / mb:.1f} Mo")
+
+
+def main(argv=None):
+    """Exécute le banc d'essai sur des instances synthétiques de taille croissante."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ring_star.benchmark",
+        description="Mesure le passage à l'échelle des opérateurs du RSP.",
+    )
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "-l", "--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS)
+    )
+    parser.add_argument("-a", "--alpha", type=int, default=3)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "-r",
+        "--ring-share",
+        type=float,
+        default=RING_SHARE,
+        help="proportion des nœuds placés dans le Ring de départ",
+    )
+    parser.add_argument(
+        "-k",
+        "--repeats",
+        type=int,
+        default=REPEATS,
+        help="nombre de constructions dont on garde la durée médiane",
+    )
+    parser.add_argument(
+        "-b",
+        "--budget",
+        type=float,
+        default=60.0,
+        help="durée maximale estimée d'un parcours de voisinage (secondes)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tabu",
+        action="store_true",
+        help="mesure aussi TabuNeighbors (coûteux en mémoire)",
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in args.layouts:
+            previous = {}
+            for N in sorted(args.sizes):
+                filepath = Path(tmp) / f"{layout}_{N}.dat"
+                points = generate_points(N, layout, args.seed)
+                write_instance(filepath, points, args.alpha)
+                result = bench_instance(
+                    filepath,
+                    args.budget,
+                    previous,
+                    args.seed,
+                    args.tabu,
+                    args.ring_share,
+                    args.repeats,
+                )
+                _report(layout, result)
+                filepath.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,22 @@ algorithmes d'optimisation.
 
 Functions:
     load_data: Charge les matrices de coûts depuis un fichier d'instance.
+    parse_data: Construit les matrices de coûts depuis le contenu d'une
+        instance (texte au format `.dat`).
+    NarrowType: Choisit le type entier le plus compact pour un intervalle.
+    CompactMatrix: Compacte une matrice de coûts (type entier réduit,
+        triangle inférieur si symétrique).
+    CostGetter: Accès aux coûts indépendant du stockage de la matrice.
+    MemoryUsage: Estime la mémoire occupée par une instance.
     create_solution: Formate et écrit la solution finale dans un fichier.
     CalculCost: Évalue le coût total (Ring + Stars) d'une solution.
     OptimizedCost: Calcule le coût optimal d'insertion dans le Ring ou
         d'affectation à une Star (fonction gloutonne).
-    InitSol: Génère une solution initiale valide (aléatoire ou gloutonne).
+    InitSol: Génère une solution initiale valide (aléatoire ou gloutonne),
+        éventuellement avec un Ring de taille imposée.
     IS_Iterate: Génère plusieurs solutions initiales pour ne conserver
-        que la meilleure (stratégie de redémarrage).
+        que la meilleure (stratégie de redémarrage), en s'arrêtant plus
+        tôt si la fonction `stop` le demande.
     BestNeighbor: Explore le voisinage (Inversion, Transposition,
         Déplacement) pour trouver le meilleur mouvement améliorant.
     TabuNeighbors: Génère la liste complète des voisins pour
@@ -23,25 +32,113 @@ Functions:
 """
 
 import random
+import sys
+from array import array
+
+from ring_star.hashing import MoveHash, SwapHash
 
 
 def load_data(name):
 
     with open(name, "r") as f:
-        N = int(f.readline())
-        data = f.readlines()
+        output = _read(f)
         f.close()
 
-    mat1, mat2 = [], []
-    for i in range(N):
-        mat1.append(list(map(int, data[i].split())))
-        mat2.append(list(map(int, data[N + i].split())))
+    return output
+
+
+def parse_data(text):
+
+    return _read(iter(text.splitlines()))
+
+
+def _read(lines):
+
+    N = int(next(lines))
+    # Lecture ligne par ligne : seule la matrice en cours est conservée en
+    # entiers 64 bits avant d'être compactée
+    mat1 = CompactMatrix([_row(lines) for _ in range(N)])
+    mat2 = CompactMatrix([_row(lines) for _ in range(N)])
 
     output = [N, mat1, mat2]
 
     return output
 
 
+def _row(lines):
+
+    return array("q", map(int, next(lines).split()))
+
+
+def NarrowType(low, high):
+    """Renvoie le type `array` le plus compact contenant [low, high]."""
+    typecodes = "BHILQ" if low >= 0 else "bhilq"
+    for typecode in sorted(typecodes, key=lambda t: array(t).itemsize):
+        bits = 8 * array(typecode).itemsize
+        if typecode.isupper() and high < 1 << bits:
+            return typecode
+        if typecode.islower() and -(1 << (bits - 1)) <= low <= high < 1 << (bits - 1):
+            return typecode
+
+    raise OverflowError(f"Valeurs hors limites (64 bits) : [{low}, {high}]")
+
+
+def CompactMatrix(rows):
+    """Compacte une matrice de coûts (liste de lignes).
+
+    Chaque ligne est un tableau du type entier le plus étroit possible,
+    indexé directement par les numéros de sommets (la ligne 0 et la
+    colonne 0 sont vides) : mat[a][b] est le coût entre a et b.
+    Une matrice symétrique est réduite à son triangle inférieur (la ligne a
+    s'arrête à la colonne a) ; le coût se lit alors
+    `mat[a][b] if a >= b else mat[b][a]`. Une matrice non symétrique est
+    conservée en entier.
+    """
+    N = len(rows)
+    rows = [row if isinstance(row, array) else array("q", row) for row in rows]
+    typecode = NarrowType(min(map(min, rows)), max(map(max, rows)))
+
+    symmetric = all(
+        rows[i][i + 1 :] == array("q", (rows[j][i] for j in range(i + 1, N)))
+        for i in range(N)
+    )
+    mat = [array(typecode)]
+    for i in range(N):
+        row = rows[i][: i + 1] if symmetric else rows[i]
+        mat.append(array(typecode, [0]) + array(typecode, row))
+
+    return mat
+
+
+def CostGetter(mat):
+    """Renvoie une fonction donnant le coût entre deux sommets (numérotés à
+    partir de 1), que la matrice soit complète ou triangulaire."""
+    if len(mat[1]) < len(mat):
+
+        def get(a, b):
+            return mat[a][b] if a >= b else mat[b][a]
+
+        return get
+
+    def get(a, b):
+        return mat[a][b]
+
+    return get
+
+
+def MemoryUsage(data):
+    """Estime la mémoire occupée par les deux matrices de coûts (en octets)."""
+    size = 0
+    for mat in data[1:3]:
+        size += sys.getsizeof(mat)
+        for row in mat:
+            size += sys.getsizeof(row)
+            if not isinstance(row, array):
+                size += sum(map(sys.getsizeof, row))
+
+    return size
+
+
 def create_solution(name, sol):
     """Pour N sommets au total, sol est une liste contenant :
     
@@ -68,24 +165,24 @@ def create_solution(name, sol):
 
 def CalculCost(data, sol):
 
-    mat1, mat2 = data[1], data[2]
+    mat1, mat2 = CostGetter(data[1]), CostGetter(data[2])
     ring, star = sol[0], sol[1]
     cost = 0
 
     # Coûts liés au Ring (Matrice 1)
     for i in range(len(ring)):
-        cost += mat1[ring[i] - 1][ring[i - 1] - 1]
+        cost += mat1(ring[i], ring[i - 1])
 
     # Coûts liés aux dépôts (Matrice 2)
     for i in range(len(star)):
-        cost += mat2[star[i][0] - 1][star[i][1] - 1]
+        cost += mat2(star[i][0], star[i][1])
 
     return cost
 
 
 def OptimizedCost(data, val):
 
-    mat1, mat2 = data[1], data[2]
+    mat1, mat2 = CostGetter(data[1]), CostGetter(data[2])
 
     if type(val) == list:  # Ring (Matrice 1)
 
@@ -100,7 +197,7 @@ def OptimizedCost(data, val):
                 val.pop(index)
                 temp = float("inf")
                 for j in range(len(val)):
-                    cost = mat1[verif - 1][val[j] - 1]
+                    cost = mat1(verif, val[j])
                     if cost < temp:
                         temp = cost
                         s = val[j]
@@ -112,7 +209,7 @@ def OptimizedCost(data, val):
         ring = data[3]
         temp = float("inf")
         for s in ring:
-            cost = mat2[s - 1][val]
+            cost = mat2(s, val + 1)
             if cost < temp:
                 temp = cost
                 output = s
@@ -121,12 +218,12 @@ def OptimizedCost(data, val):
 
 
 # Solution initiale
-def InitSol(data):
+def InitSol(data, size=None):
 
     N = data[0]
 
-    # Ring aléatoire optimisé
-    x = random.randint(1, N)
+    # Ring aléatoire optimisé (de taille `size` si elle est imposée)
+    x = random.randint(1, N) if size is None else size
     ring = [1]
     i = 1
     while i < x:
@@ -151,7 +248,7 @@ def InitSol(data):
     return sol
 
 
-def IS_Iterate(data, N):
+def IS_Iterate(data, N, stop=None):
 
     temp = float("inf")
     for _ in range(N):
@@ -160,13 +257,19 @@ def IS_Iterate(data, N):
         if cost < temp:
             temp = cost
             save = sol.copy()
+        # Au moins une solution est toujours construite
+        if stop is not None and stop():
+            break
 
     return save
 
 
 def BestNeighbor(data, sol, choice):
 
+    # Coûts lus directement dans la matrice (voir CompactMatrix) : lecture
+    # orientée mat1[x][y] si elle est complète, triangle inférieur sinon
     mat1 = data[1]
+    full = len(mat1[1]) == len(mat1)
     ring, initcost = sol[0], sol[2]
     cost = initcost
 
@@ -177,23 +280,26 @@ def BestNeighbor(data, sol, choice):
         for i in range(len(ring)):
             if i == len(ring) - 1:
                 i = -1
-            beforecost = (
-                mat1[ring[i] - 1][ring[i + 1] - 1]
-                + mat1[ring[i - 1] - 1][ring[i - 2] - 1]
+            a, b, c, d = ring[i - 2], ring[i - 1], ring[i], ring[i + 1]
+            beforecost = (mat1[c][d] if c >= d or full else mat1[d][c]) + (
+                mat1[b][a] if b >= a or full else mat1[a][b]
             )
-            aftercost = (
-                mat1[ring[i] - 1][ring[i - 2] - 1]
-                + mat1[ring[i - 1] - 1][ring[i + 1] - 1]
+            aftercost = (mat1[c][a] if c >= a or full else mat1[a][c]) + (
+                mat1[b][d] if b >= d or full else mat1[d][b]
             )
             new_cost = initcost - beforecost + aftercost
             if new_cost < cost:
                 index, cost = i, new_cost
 
         if index > -2:
+            if len(sol) > 3:
+                sol[3] = SwapHash(ring, sol[3], index, index - 1)
             ring[index], ring[index - 1] = ring[index - 1], ring[index]
             sol[2] = cost
         else:
             a = random.randint(0, len(ring) - 1)
+            if len(sol) > 3:
+                sol[3] = SwapHash(ring, sol[3], a, a - 1)
             ring[a], ring[a - 1] = ring[a - 1], ring[a]
             cost = CalculCost(data, sol)
             sol[2] = cost
@@ -206,34 +312,38 @@ def BestNeighbor(data, sol, choice):
             for j in range(i + 1, len(ring)):
                 if j == len(ring) - 1:
                     j = -1
+                a, b, c = ring[i - 1], ring[i], ring[i + 1]
+                d, e, f = ring[j - 1], ring[j], ring[j + 1]
                 beforecost = (
-                    mat1[ring[i] - 1][ring[i - 1] - 1]
-                    + mat1[ring[i] - 1][ring[i + 1] - 1]
-                )
-                beforecost += (
-                    mat1[ring[j] - 1][ring[j - 1] - 1]
-                    + mat1[ring[j] - 1][ring[j + 1] - 1]
+                    (mat1[b][a] if b >= a or full else mat1[a][b])
+                    + (mat1[b][c] if b >= c or full else mat1[c][b])
+                    + (mat1[e][d] if e >= d or full else mat1[d][e])
+                    + (mat1[e][f] if e >= f or full else mat1[f][e])
                 )
                 newring = ring.copy()
                 newring[i], newring[j] = newring[j], newring[i]
+                a, b, c = newring[i - 1], newring[i], newring[i + 1]
+                d, e, f = newring[j - 1], newring[j], newring[j + 1]
                 aftercost = (
-                    mat1[newring[i] - 1][newring[i - 1] - 1]
-                    + mat1[newring[i] - 1][newring[i + 1] - 1]
-                )
-                aftercost += (
-                    mat1[newring[j] - 1][newring[j - 1] - 1]
-                    + mat1[newring[j] - 1][newring[j + 1] - 1]
+                    (mat1[b][a] if b >= a or full else mat1[a][b])
+                    + (mat1[b][c] if b >= c or full else mat1[c][b])
+                    + (mat1[e][d] if e >= d or full else mat1[d][e])
+                    + (mat1[e][f] if e >= f or full else mat1[f][e])
                 )
                 new_cost = initcost - beforecost + aftercost
                 if new_cost < cost:
                     index_i, index_j, cost = i, j, new_cost
 
         if index_i > -1:
+            if len(sol) > 3:
+                sol[3] = SwapHash(ring, sol[3], index_i, index_j)
             ring[index_i], ring[index_j] = ring[index_j], ring[index_i]
             sol[2] = cost
         else:
             a = random.randint(0, len(ring) - 2)
             b = random.randint(a + 1, len(ring) - 1)
+            if len(sol) > 3:
+                sol[3] = SwapHash(ring, sol[3], a, b)
             ring[a], ring[b] = ring[b], ring[a]
             cost = CalculCost(data, sol)
             sol[2] = cost
@@ -254,43 +364,57 @@ def BestNeighbor(data, sol, choice):
                     continue
                 # Cas où le déplacement se fait à l'envers
                 if (j < i and j > -1) or i == -1:
+                    a, b, c = ring[i - 1], ring[i], ring[i + 1]
+                    d, e = ring[j - 1], ring[j]
                     beforecost = (
-                        mat1[ring[i] - 1][ring[i - 1] - 1]
-                        + mat1[ring[i] - 1][ring[i + 1] - 1]
+                        (mat1[b][a] if b >= a or full else mat1[a][b])
+                        + (mat1[b][c] if b >= c or full else mat1[c][b])
+                        + (mat1[e][d] if e >= d or full else mat1[d][e])
                     )
-                    beforecost += mat1[ring[j] - 1][ring[j - 1] - 1]
                     newring = ring.copy()
                     if i == -1:
                         newring[j], newring[j + 1 :] = newring[i], newring[j:i]
                     else:
                         newring[j], newring[j + 1 : i + 1] = newring[i], newring[j:i]
-                    aftercost = mat1[newring[i] - 1][newring[i + 1] - 1]
-                    aftercost += (
-                        mat1[newring[j] - 1][newring[j - 1] - 1]
-                        + mat1[newring[j] - 1][newring[j + 1] - 1]
+                    b, c = newring[i], newring[i + 1]
+                    d, e, f = newring[j - 1], newring[j], newring[j + 1]
+                    aftercost = (
+                        (mat1[b][c] if b >= c or full else mat1[c][b])
+                        + (mat1[e][d] if e >= d or full else mat1[d][e])
+                        + (mat1[e][f] if e >= f or full else mat1[f][e])
                     )
                 # Cas où le déplacement se fait vers l'avant
                 else:
+                    a, b, c = ring[i - 1], ring[i], ring[i + 1]
+                    e, f = ring[j], ring[j + 1]
                     beforecost = (
-                        mat1[ring[i] - 1][ring[i - 1] - 1]
-                        + mat1[ring[i] - 1][ring[i + 1] - 1]
+                        (mat1[b][a] if b >= a or full else mat1[a][b])
+                        + (mat1[b][c] if b >= c or full else mat1[c][b])
+                        + (mat1[e][f] if e >= f or full else mat1[f][e])
                     )
-                    beforecost += mat1[ring[j] - 1][ring[j + 1] - 1]
                     newring = ring.copy()
                     if j == -1:
                         newring[j], newring[i:j] = newring[i], newring[i + 1 :]
                     else:
                         newring[j], newring[i:j] = newring[i], newring[i + 1 : j + 1]
-                    aftercost = mat1[newring[i] - 1][newring[i - 1] - 1]
-                    aftercost += (
-                        mat1[newring[j] - 1][newring[j - 1] - 1]
-                        + mat1[newring[j] - 1][newring[j + 1] - 1]
+                    a, b = newring[i - 1], newring[i]
+                    d, e, f = newring[j - 1], newring[j], newring[j + 1]
+                    aftercost = (
+                        (mat1[b][a] if b >= a or full else mat1[a][b])
+                        + (mat1[e][d] if e >= d or full else mat1[d][e])
+                        + (mat1[e][f] if e >= f or full else mat1[f][e])
                     )
 
                 new_cost = initcost - beforecost + aftercost
                 if new_cost < cost:
                     index_i, index_j, cost = i, j, new_cost
 
+        # Aucun déplacement améliorant : le ring reste inchangé
+        if index_i == -2:
+            return sol
+
+        if len(sol) > 3:
+            sol[3] = MoveHash(ring, sol[3], index_i, index_j)
         if (index_j < index_i and index_j > -1) or index_i == -1:
             if index_i == -1:
                 ring[index_j], ring[index_j + 1 :] = (
@@ -322,7 +446,10 @@ def BestNeighbor(data, sol, choice):
 def TabuNeighbors(data, sol, choice):
 
     S = []
+    # Coûts lus directement dans la matrice (voir CompactMatrix) : lecture
+    # orientée mat1[x][y] si elle est complète, triangle inférieur sinon
     mat1 = data[1]
+    full = len(mat1[1]) == len(mat1)
     ring = sol[0]
     initcost = sol[2]
 
@@ -332,13 +459,12 @@ def TabuNeighbors(data, sol, choice):
             if i == len(ring) - 1:
                 i = -1
 
-            beforecost = (
-                mat1[ring[i] - 1][ring[i + 1] - 1]
-                + mat1[ring[i - 1] - 1][ring[i - 2] - 1]
+            a, b, c, d = ring[i - 2], ring[i - 1], ring[i], ring[i + 1]
+            beforecost = (mat1[c][d] if c >= d or full else mat1[d][c]) + (
+                mat1[b][a] if b >= a or full else mat1[a][b]
             )
-            aftercost = (
-                mat1[ring[i] - 1][ring[i - 2] - 1]
-                + mat1[ring[i - 1] - 1][ring[i + 1] - 1]
+            aftercost = (mat1[c][a] if c >= a or full else mat1[a][c]) + (
+                mat1[b][d] if b >= d or full else mat1[d][b]
             )
             new_cost = initcost - beforecost + aftercost
 
@@ -346,7 +472,10 @@ def TabuNeighbors(data, sol, choice):
             newring[i], newring[i - 1] = newring[i - 1], newring[i]
 
             # On ajoute le voisin à la liste
-            S.append([newring, sol[1], new_cost])
+            neighbor = [newring, sol[1], new_cost]
+            if len(sol) > 3:
+                neighbor += [SwapHash(ring, sol[3], i, i - 1), sol[4]]
+            S.append(neighbor)
 
     # 2. Transposition (Swap général)
     elif choice == 2:
@@ -355,29 +484,32 @@ def TabuNeighbors(data, sol, choice):
                 if j == len(ring) - 1:
                     j = -1
 
+                a, b, c = ring[i - 1], ring[i], ring[i + 1]
+                d, e, f = ring[j - 1], ring[j], ring[j + 1]
                 beforecost = (
-                    mat1[ring[i] - 1][ring[i - 1] - 1]
-                    + mat1[ring[i] - 1][ring[i + 1] - 1]
-                )
-                beforecost += (
-                    mat1[ring[j] - 1][ring[j - 1] - 1]
-                    + mat1[ring[j] - 1][ring[j + 1] - 1]
+                    (mat1[b][a] if b >= a or full else mat1[a][b])
+                    + (mat1[b][c] if b >= c or full else mat1[c][b])
+                    + (mat1[e][d] if e >= d or full else mat1[d][e])
+                    + (mat1[e][f] if e >= f or full else mat1[f][e])
                 )
 
                 newring = ring.copy()
                 newring[i], newring[j] = newring[j], newring[i]
 
+                a, b, c = newring[i - 1], newring[i], newring[i + 1]
+                d, e, f = newring[j - 1], newring[j], newring[j + 1]
                 aftercost = (
-                    mat1[newring[i] - 1][newring[i - 1] - 1]
-                    + mat1[newring[i] - 1][newring[i + 1] - 1]
-                )
-                aftercost += (
-                    mat1[newring[j] - 1][newring[j - 1] - 1]
-                    + mat1[newring[j] - 1][newring[j + 1] - 1]
+                    (mat1[b][a] if b >= a or full else mat1[a][b])
+                    + (mat1[b][c] if b >= c or full else mat1[c][b])
+                    + (mat1[e][d] if e >= d or full else mat1[d][e])
+                    + (mat1[e][f] if e >= f or full else mat1[f][e])
                 )
 
                 new_cost = initcost - beforecost + aftercost
-                S.append([newring, sol[1], new_cost])
+                neighbor = [newring, sol[1], new_cost]
+                if len(sol) > 3:
+                    neighbor += [SwapHash(ring, sol[3], i, j), sol[4]]
+                S.append(neighbor)
 
     # 3. Déplacement (Insertion)
     elif choice == 3:
@@ -395,11 +527,13 @@ def TabuNeighbors(data, sol, choice):
 
                 # Cas A : Le déplacement se fait "vers l'arrière" ou cas spécial fin de liste
                 if (j < i and j > -1) or i == -1:
+                    a, b, c = ring[i - 1], ring[i], ring[i + 1]
+                    d, e = ring[j - 1], ring[j]
                     beforecost = (
-                        mat1[ring[i] - 1][ring[i - 1] - 1]
-                        + mat1[ring[i] - 1][ring[i + 1] - 1]
+                        (mat1[b][a] if b >= a or full else mat1[a][b])
+                        + (mat1[b][c] if b >= c or full else mat1[c][b])
+                        + (mat1[e][d] if e >= d or full else mat1[d][e])
                     )
-                    beforecost += mat1[ring[j] - 1][ring[j - 1] - 1]
 
                     newring = ring.copy()
                     # Logique de slicing python pour l'insertion
@@ -408,19 +542,23 @@ def TabuNeighbors(data, sol, choice):
                     else:
                         newring[j], newring[j + 1 : i + 1] = newring[i], newring[j:i]
 
-                    aftercost = mat1[newring[i] - 1][newring[i + 1] - 1]
-                    aftercost += (
-                        mat1[newring[j] - 1][newring[j - 1] - 1]
-                        + mat1[newring[j] - 1][newring[j + 1] - 1]
+                    b, c = newring[i], newring[i + 1]
+                    d, e, f = newring[j - 1], newring[j], newring[j + 1]
+                    aftercost = (
+                        (mat1[b][c] if b >= c or full else mat1[c][b])
+                        + (mat1[e][d] if e >= d or full else mat1[d][e])
+                        + (mat1[e][f] if e >= f or full else mat1[f][e])
                     )
 
                 # Cas B : Le déplacement se fait "vers l'avant"
                 else:
+                    a, b, c = ring[i - 1], ring[i], ring[i + 1]
+                    e, f = ring[j], ring[j + 1]
                     beforecost = (
-                        mat1[ring[i] - 1][ring[i - 1] - 1]
-                        + mat1[ring[i] - 1][ring[i + 1] - 1]
+                        (mat1[b][a] if b >= a or full else mat1[a][b])
+                        + (mat1[b][c] if b >= c or full else mat1[c][b])
+                        + (mat1[e][f] if e >= f or full else mat1[f][e])
                     )
-                    beforecost += mat1[ring[j] - 1][ring[j + 1] - 1]
 
                     newring = ring.copy()
                     if j == -1:
@@ -428,15 +566,19 @@ def TabuNeighbors(data, sol, choice):
                     else:
                         newring[j], newring[i:j] = newring[i], newring[i + 1 : j + 1]
 
-                    aftercost = mat1[newring[i] - 1][newring[i - 1] - 1]
-                    aftercost += (
-                        mat1[newring[j] - 1][newring[j - 1] - 1]
-                        + mat1[newring[j] - 1][newring[j + 1] - 1]
+                    a, b = newring[i - 1], newring[i]
+                    d, e, f = newring[j - 1], newring[j], newring[j + 1]
+                    aftercost = (
+                        (mat1[b][a] if b >= a or full else mat1[a][b])
+                        + (mat1[e][d] if e >= d or full else mat1[d][e])
+                        + (mat1[e][f] if e >= f or full else mat1[f][e])
                     )
 
                 new_cost = initcost - beforecost + aftercost
-
-                S.append([newring, sol[1], new_cost])
+                neighbor = [newring, sol[1], new_cost]
+                if len(sol) > 3:
+                    neighbor += [MoveHash(ring, sol[3], i, j), sol[4]]
+                S.append(neighbor)
 
     return S
 
@@ -0,0 +1,128 @@
+"""Génération d'instances synthétiques pour le problème Ring Star.
+
+Ce module produit des instances au format `.dat` à partir de nuages de
+points aléatoires (reproductibles grâce à une graine). Les coûts suivent
+la relation habituelle des instances fournies : pour une distance
+euclidienne arrondie d entre deux nœuds, le coût du Ring vaut alpha * d
+et le coût d'affectation vaut (10 - alpha) * d, avec alpha dans {3, 7, 9}.
+
+L'écriture se fait ligne par ligne, sans construire les matrices en
+mémoire, afin de pouvoir générer des instances de grande taille
+(N = 5 000 ou 10 000).
+
+Functions:
+    generate_points: Génère un nuage de points uniforme ou en clusters.
+    write_instance: Écrit une instance `.dat` à partir d'un nuage de points.
+    generate_instance: Construit directement une instance en mémoire, au
+        même format (matrices compactées) que `load_data`.
+    main: Point d'entrée en ligne de commande.
+"""
+
+import argparse
+import math
+import random
+from pathlib import Path
+
+from ring_star.functions import CompactMatrix
+
+LAYOUTS = ("uniform", "clustered")
+ALPHAS = (3, 7, 9)
+SIZES = (500, 1000, 5000, 10000)
+
+
+def generate_points(N, layout="uniform", seed=None, side=1000):
+    """Génère N points dans le carré [0, side]².
+
+    - layout = "uniform" : points tirés uniformément dans le carré.
+    - layout = "clustered" : points répartis autour de centres tirés
+      uniformément (environ sqrt(N) clusters, dispersion gaussienne).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Disposition inconnue : {layout!r} (options : {LAYOUTS})")
+
+    rng = random.Random(seed)
+
+    if layout == "uniform":
+        return [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(N)]
+
+    k = max(1, round(math.sqrt(N)))
+    sigma = side / (4 * k)
+    centers = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(k)]
+    points = []
+    for _ in range(N):
+        cx, cy = rng.choice(centers)
+        x = min(max(rng.gauss(cx, sigma), 0), side)
+        y = min(max(rng.gauss(cy, sigma), 0), side)
+        points.append((x, y))
+
+    return points
+
+
+def _distances(points, i):
+
+    xi, yi = points[i]
+    return [round(math.hypot(xi - x, yi - y)) for x, y in points]
+
+
+def write_instance(name, points, alpha=3):
+    """Écrit l'instance associée à `points` dans le fichier `name`.
+
+    Les matrices sont calculées et écrites ligne par ligne : la mémoire
+    utilisée reste en O(N) quelle que soit la taille de l'instance.
+    """
+    if not 0 < alpha < 10:
+        raise ValueError(f"alpha doit être compris entre 1 et 9 : {alpha}")
+
+    N = len(points)
+    with open(name, "w") as f:
+        f.write(f"{N} \n")
+        for factor in (alpha, 10 - alpha):
+            for i in range(N):
+                row = _distances(points, i)
+                f.write(" " + " ".join(str(factor * d) for d in row) + " \n")
+
+
+def generate_instance(N, layout="uniform", alpha=3, seed=None):
+    """Construit une instance en mémoire, au format [N, mat1, mat2]."""
+    if not 0 < alpha < 10:
+        raise ValueError(f"alpha doit être compris entre 1 et 9 : {alpha}")
+
+    points = generate_points(N, layout, seed)
+    mat1, mat2 = [], []
+    for i in range(N):
+        row = _distances(points, i)
+        mat1.append([alpha * d for d in row])
+        mat2.append([(10 - alpha) * d for d in row])
+
+    return [N, CompactMatrix(mat1), CompactMatrix(mat2)]
+
+
+def main(argv=None):
+    """Génère une série d'instances synthétiques dans un dossier."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ring_star.generator",
+        description="Génère des instances synthétiques du Ring Star Problem.",
+    )
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "-l", "--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS)
+    )
+    parser.add_argument("-a", "--alphas", type=int, nargs="+", default=[ALPHAS[0]])
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="instances/synthetic")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    for N in args.sizes:
+        for layout in args.layouts:
+            points = generate_points(N, layout, args.seed)
+            for alpha in args.alphas:
+                filepath = output / f"{layout}_{N}_a{alpha}_s{args.seed}.dat"
+                write_instance(filepath, points, alpha)
+                print(f"  • {filepath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Hachage de Zobrist des solutions du problème Ring Star.
+
+Ce module permet d'identifier une solution par une empreinte de 64 bits
+calculée une fois en O(n), puis mise à jour en O(1) à chaque mouvement.
+
+- Empreinte du Ring : XOR des clés des arêtes (non orientées) de
+  l'anneau. Elle ne dépend ni du nœud de départ ni du sens de parcours :
+  deux rings décrivant le même cycle ont la même empreinte.
+- Empreinte des membres : XOR des clés des nœuds de l'anneau. Les
+  opérateurs de voisinage ne faisant que permuter le ring, elle reste
+  constante pendant une descente.
+
+Les affectations des Stars étant déterminées par les membres du ring,
+le couple (empreinte du Ring, empreinte des membres) identifie la
+solution. Les clés sont obtenues par mélange (splitmix64) des numéros de
+nœuds : aucune table n'est stockée, quelle que soit la taille de
+l'instance.
+
+Functions:
+    NodeKey: Clé de Zobrist d'un nœud.
+    EdgeKey: Clé de Zobrist d'une arête non orientée.
+    RingHash: Empreinte complète d'un ring.
+    MemberHash: Empreinte de l'ensemble des nœuds d'un ring.
+    HashSol: Ajoute les deux empreintes à une solution.
+    SolKey: Renvoie l'identifiant (empreintes) d'une solution hachée.
+    SwapHash: Met à jour l'empreinte après l'échange de deux positions.
+    MoveHash: Met à jour l'empreinte après le déplacement d'un nœud.
+
+Classes:
+    VisitedCache: Ensemble borné (LRU) des solutions déjà visitées.
+"""
+
+from collections import OrderedDict
+
+MASK = (1 << 64) - 1
+NODE_SALT = 0x243F6A8885A308D3
+EDGE_SALT = 0x13198A2E03707344
+
+
+def _mix(x):
+
+    # splitmix64
+    x = (x + 0x9E3779B97F4A7C15) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+def NodeKey(a):
+
+    return _mix(a ^ NODE_SALT)
+
+
+def EdgeKey(a, b):
+
+    if a > b:
+        a, b = b, a
+    return _mix(((a << 32) | b) ^ EDGE_SALT)
+
+
+def RingHash(ring):
+
+    h = 0
+    for i in range(len(ring)):
+        h ^= EdgeKey(ring[i - 1], ring[i])
+
+    return h
+
+
+def MemberHash(ring):
+
+    h = 0
+    for s in ring:
+        h ^= NodeKey(s)
+
+    return h
+
+
+def HashSol(sol):
+    """Complète sol avec sol[3] (empreinte du Ring) et sol[4] (membres).
+
+    Les opérateurs de `functions` maintiennent ces deux valeurs lorsqu'elles
+    sont présentes.
+    """
+    del sol[3:]
+    sol.append(RingHash(sol[0]))
+    sol.append(MemberHash(sol[0]))
+
+    return sol
+
+
+def SolKey(sol):
+
+    return sol[3], sol[4]
+
+
+def _edges_around(n, positions):
+
+    # Indices de départ des arêtes (k, k + 1) incidentes aux positions
+    return {(k + d) % n for k in positions for d in (-1, 0)}
+
+
+def SwapHash(ring, h, i, j):
+    """Empreinte du ring obtenu en échangeant les positions i et j.
+
+    Seules les arêtes incidentes aux deux positions changent : le calcul
+    est en O(1) et ne modifie pas `ring`.
+    """
+    n = len(ring)
+    i, j = i % n, j % n
+
+    def value(k):
+        if k == i:
+            return ring[j]
+        if k == j:
+            return ring[i]
+        return ring[k]
+
+    for k in _edges_around(n, (i, j)):
+        h ^= EdgeKey(ring[k], ring[(k + 1) % n])
+        h ^= EdgeKey(value(k), value((k + 1) % n))
+
+    return h
+
+
+def MoveHash(ring, h, i, j):
+    """Empreinte du ring obtenu en déplaçant le nœud en position i pour
+    qu'il se retrouve en position j (les nœuds intermédiaires étant décalés).
+
+    Le retrait du nœud remplace deux arêtes par une, son insertion remplace
+    une arête par deux : le calcul est en O(1) et ne modifie pas `ring`.
+    """
+    n = len(ring)
+    i, j = i % n, j % n
+    s = ring[i]
+    before, after = ring[i - 1], ring[(i + 1) % n]
+    h ^= EdgeKey(before, s) ^ EdgeKey(s, after) ^ EdgeKey(before, after)
+
+    def without(k):
+        k %= n - 1
+        return ring[k] if k < i else ring[k + 1]
+
+    before, after = without(j - 1), without(j)
+    h ^= EdgeKey(before, after) ^ EdgeKey(before, s) ^ EdgeKey(s, after)
+
+    return h
+
+
+class VisitedCache:
+    """Ensemble borné des solutions déjà visitées (identifiées par SolKey).
+
+    Lorsque la capacité est atteinte, la solution consultée le moins
+    récemment est oubliée.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.keys = OrderedDict()
+
+    def __contains__(self, key):
+        if key in self.keys:
+            self.keys.move_to_end(key)
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key):
+        self.keys[key] = None
+        self.keys.move_to_end(key)
+        if len(self.keys) > self.maxsize:
+            self.keys.popitem(last=False)
@@ -13,7 +13,7 @@ Métaheuristiques disponibles :
 
 from pathlib import Path
 
-from ring_star.functions import create_solution, load_data
+from ring_star.functions import MemoryUsage, create_solution, load_data
 from ring_star.metaheuristics import LS_Iterate, RecSim, TabuSearch
 
 
@@ -49,6 +49,7 @@ def main():
         print(f"\n--- Solution {i + 1} terminée ---")
         print(f"  • Coût total : {sol[2]}")
         print(f"  • Proportion de nœuds dans l'anneau : {100 * len(sol[0]) / data[0]:.2f} %")
+        print(f"  • Mémoire de l'instance : {MemoryUsage(data) / 1024:.1f} Ko")
         # Optionnel : Aperçu détaillé de la solution
         # print(f"  • Détails de la solution :\n    - Ring : {sol[0]}\n    - Star : {sol[1]}")
 
@@ -5,9 +5,20 @@ opérateurs définis dans le module `functions`. Il implémente plusieurs
 stratégies de recherche locale et globale pour explorer l'espace des
 solutions et minimiser la fonction de coût. Les algorithmes inclus
 gèrent des critères d'arrêt basés sur le temps d'exécution et utilisent
-des mécanismes d'intensification et de diversification.
+des mécanismes d'intensification et de diversification. La recherche
+locale itérée mémorise les optima locaux atteints par leur empreinte de
+Zobrist (voir le module `hashing`) : une descente qui rejoint l'un d'eux
+s'arrête aussitôt.
+
+Les métaheuristiques acceptent une durée `finaltime` (en secondes), une
+fonction `callback` appelée avec chaque nouvelle meilleure solution, et
+une fonction `stop` consultée à chaque itération pour interrompre la
+recherche avant la fin du temps imparti. La durée couvre l'ensemble de
+la résolution : la construction initiale (au plus 10 % du temps), la
+recherche, puis la recherche locale finale (10 % du temps réservés).
 
 Functions:
+    Deadline: Construit le critère d'arrêt (temps écoulé ou arrêt demandé).
     LocalSearch: Recherche locale stochastique appliquant itérativement
         le meilleur mouvement d'un voisinage aléatoire.
     LS_Iterate: Stratégie de redémarrage multiple (Multistart) lançant
@@ -25,66 +36,100 @@ import random
 import time
 
 from ring_star.functions import BestNeighbor, FindMin, IS_Iterate, TabuNeighbors
+from ring_star.hashing import HashSol, SolKey, VisitedCache
+
+# Nombre maximal d'optima locaux mémorisés
+MAX_VISITED = 10000
+
+# Parts du temps total pour la construction initiale et la recherche
+# (le reste est réservé à la recherche locale finale)
+SEED_SHARE = 0.1
+SEARCH_SHARE = 0.9
+
+
+# Critère d'arrêt
+def Deadline(start, finaltime, stop=None):
+
+    def expired():
+        return time.time() - start >= finaltime or (stop is not None and stop())
+
+    return expired
 
 
 # Recherche locale
-def LocalSearch(data, sol):
+def LocalSearch(data, sol, visited=None, stop=None):
 
     max_no_improve = 100
     count_no_improve = 0
+
+    if visited is not None and len(sol) < 5:
+        HashSol(sol)
+
     bestsol = copy.deepcopy(sol)
 
     if len(sol[0]) > 3:
         while count_no_improve < max_no_improve:
+            if stop is not None and stop():
+                break
             x = random.choices([1, 2, 3], weights=[0.2, 0.5, 0.3])[0]
             sol = BestNeighbor(data, sol, x)
             if sol[2] < bestsol[2]:
-                bestsol = sol.copy()
+                bestsol = copy.deepcopy(sol)
                 # print(f"[INFO] Best cost solution: {bestsol[2]}")
                 count_no_improve = 0
+                # La descente rejoint un optimum local déjà connu
+                if visited is not None and SolKey(sol) in visited:
+                    return bestsol
             else:
                 count_no_improve += 1
-    
+
+    if visited is not None:
+        visited.add(SolKey(bestsol))
+
     return bestsol
 
 
 # Itération de la recherche locale
-def LS_Iterate(data):
+# Temps total par défaut (Minutes * 60 secondes)
+def LS_Iterate(data, finaltime=0.5 * 60, callback=None, stop=None):
 
     temp = float("inf")
+    visited = VisitedCache(MAX_VISITED)
+    expired = Deadline(time.time(), finaltime, stop)
 
-    # Temps total (Minutes * 60 secondes)
-    finaltime = 0.5 * 60
-    start = time.time()
-
-    while time.time() - start < finaltime:
+    # Au moins une itération, pour toujours renvoyer une solution
+    while True:
 
-        sol = IS_Iterate(data, 10)
-        sol = LocalSearch(data, sol)
+        sol = IS_Iterate(data, 10, expired)
+        sol = LocalSearch(data, sol, visited, expired)
         cost = sol[2]
         if cost < temp:
             temp = cost
             bestsol = sol.copy()
+            if callback is not None:
+                callback(bestsol)
+
+        if expired():
+            break
 
     return bestsol
 
 
 # Recuit simulé
-def RecSim(data):
+# Temps total par défaut (Minutes * 60 secondes)
+def RecSim(data, finaltime=0.5 * 60, callback=None, stop=None):
 
-    sol = IS_Iterate(data, 1000)
-    bestsol = copy.deepcopy(sol)
-
-    # Temps total (Minutes * 60 secondes)
-    finaltime = 0.5 * 60
     start = time.time()
+    expired = Deadline(start, SEARCH_SHARE * finaltime, stop)
+    sol = IS_Iterate(data, 1000, Deadline(start, SEED_SHARE * finaltime, stop))
+    bestsol = copy.deepcopy(sol)
 
-    while time.time() - start < finaltime:
+    while not expired():
 
         T = random.randint(50, 300)
         Tf = random.random() * random.randint(1, 3)
         coeff = random.randint(50, 90) / 100
-        while T > Tf:
+        while T > Tf and not expired():
 
             if len(sol[0]) > 3:
                 for _ in range(10):
@@ -95,32 +140,35 @@ def RecSim(data):
                         sol = newsol.copy()
                         if sol[2] < bestsol[2]:
                             bestsol = copy.deepcopy(sol)
+                            if callback is not None:
+                                callback(bestsol)
                     else:
                         p = math.exp(-delta / T)
                         if random.random() < p:
                             sol = newsol.copy()
             T *= coeff
-        sol = IS_Iterate(data, 100)
 
-    return LocalSearch(data, bestsol)
+        sol = IS_Iterate(data, 100, expired)
+
+    return LocalSearch(data, bestsol, stop=Deadline(start, finaltime, stop))
 
 
 # Recherche tabou
-def TabuSearch(data):
+# Temps total par défaut (Minutes * 60 secondes)
+def TabuSearch(data, finaltime=0.5 * 60, callback=None, stop=None):
 
     len_init = 50
     len_max = 100
-    best_global_sol = IS_Iterate(data, 1000)
-
-    # Temps total (Minutes * 60 secondes)
-    finaltime = 0.5 * 60
     start = time.time()
+    expired = Deadline(start, SEARCH_SHARE * finaltime, stop)
+    seeding = Deadline(start, SEED_SHARE * finaltime, stop)
+    best_global_sol = IS_Iterate(data, 1000, seeding)
 
-    while time.time() - start < finaltime:
+    while not expired():
 
-        initsol = IS_Iterate(data, 100)
+        initsol = HashSol(IS_Iterate(data, 100, expired))
         tabu = []
-        Sol = []
+        Sol = set()
 
         if len(initsol[0]) > 3:
             x = random.choices([1, 2, 3], weights=[0.2, 0.4, 0.4])[0]
@@ -133,13 +181,13 @@ def TabuSearch(data):
 
             best_neighbor, i = FindMin(listsol)
             tabu.append(best_neighbor)
-            Sol.append(best_neighbor[2])
+            Sol.add(SolKey(best_neighbor))
             listsol.pop(i)
             times += 1
 
         while len(tabu) < len_max:
 
-            if time.time() - start > finaltime:
+            if expired():
                 break
 
             newtabu = copy.deepcopy(tabu)
@@ -152,18 +200,14 @@ def TabuSearch(data):
             x = random.choices([1, 2, 3], weights=[0.2, 0.4, 0.4])[0]
             listsol = TabuNeighbors(data, s_cur, x)
 
-            # On trie les voisins (du meilleur au pire)
-            verif = []
-            while listsol:
-                b_sol, idx = FindMin(listsol)
-                verif.append(b_sol)
-                listsol.pop(idx)
+            # On trie les voisins (du meilleur au pire, tri stable)
+            verif = sorted(listsol, key=lambda neighbor: neighbor[2])
 
             found_new = False
             for candidate in verif:
-                if candidate[2] not in Sol:  # Vérification simple sur le coût
+                if SolKey(candidate) not in Sol:  # Critère tabou exact (empreinte)
                     tabu.append(candidate)
-                    Sol.append(candidate[2])
+                    Sol.add(SolKey(candidate))
                     found_new = True
                     break
 
@@ -174,5 +218,7 @@ def TabuSearch(data):
             local_best, _ = FindMin(tabu)
             if local_best[2] < best_global_sol[2]:
                 best_global_sol = copy.deepcopy(local_best)
+                if callback is not None:
+                    callback(best_global_sol)
 
-    return LocalSearch(data, best_global_sol)
+    return LocalSearch(data, best_global_sol, stop=Deadline(start, finaltime, stop))
@@ -0,0 +1,610 @@
+"""Service local de résolution pour le problème Ring Star.
+
+Ce module fournit un serveur asyncio qui garde en vie un ensemble de
+processus de calcul (workers) afin d'éviter, pour chaque résolution, le
+coût de démarrage d'un interpréteur et de chargement des instances.
+
+Les échanges se font par messages JSON, un par ligne, sur une socket TCP
+locale (ou une socket Unix). Chaque requête porte un identifiant `id`,
+repris dans toutes les réponses qui la concernent :
+
+    - {"op": "load", "id": ..., "path": ...} ou {"op": "load", "id": ...,
+      "data": ...} : enregistre une instance, identifiée par l'empreinte
+      SHA-256 de son contenu (réponse : événement "loaded").
+    - {"op": "solve", "id": ..., "instance": ..., "method": ...,
+      "budget": ..., "priority": ..., "seed": ...} : soumet une résolution.
+      Les travaux en attente sont servis par priorité décroissante puis
+      par ordre d'arrivée. Le serveur envoie les événements "queued",
+      "started", "incumbent" (à chaque amélioration) puis "done".
+    - {"op": "cancel", "id": ...} : annule une résolution. Un travail en
+      cours s'arrête à la fin de l'itération courante et renvoie la
+      meilleure solution trouvée.
+
+La lecture, la vérification et le hachage d'une instance se font hors de
+la boucle d'événements. Pour une instance enregistrée depuis un fichier,
+le serveur ne garde que son chemin : le worker qui ne l'a pas en cache
+relit le fichier et vérifie son empreinte. Le texte des instances
+transmises directement est conservé dans la limite d'une taille totale.
+
+Chaque worker conserve les instances déjà reçues (cache LRU par
+empreinte) : une instance n'est transmise qu'une fois à chaque worker.
+Le worker renvoie avec chaque résultat la liste des empreintes qu'il
+conserve, que le serveur reprend telle quelle.
+Un worker qui s'arrête de façon inattendue est relancé, et le travail
+qu'il exécutait se termine par un événement "error".
+
+Functions:
+    main: Point d'entrée en ligne de commande du serveur.
+
+Classes:
+    SolveService: Serveur de résolution et son pool de workers.
+    SolveClient: Client asyncio minimal pour le serveur.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import itertools
+import json
+import multiprocessing
+import random
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from ring_star.functions import parse_data
+from ring_star.metaheuristics import LS_Iterate, RecSim, TabuSearch
+
+METHODS = {
+    "local_search": LS_Iterate,
+    "simulated_annealing": RecSim,
+    "tabu_search": TabuSearch,
+}
+
+# Taille maximale d'un message (une instance peut être envoyée en entier)
+LIMIT = 1 << 30
+
+# Intervalle de surveillance des workers (secondes)
+WATCH_INTERVAL = 0.5
+
+
+def _solution(sol):
+
+    return {"ring": sol[0], "star": sol[1], "cost": sol[2]}
+
+
+def _check_instance(lines, digest):
+
+    # Vérification légère du format avant d'accepter une instance. Le
+    # traitement se fait ligne par ligne, dans une boucle Python : le thread
+    # de lecture ne garde jamais longtemps le verrou global de l'interpréteur
+    lines = iter(lines)
+    header = next(lines, "")
+    digest.update(header.encode())
+    try:
+        N = int(header)
+    except ValueError:
+        raise ValueError(
+            "Instance invalide : en-tête attendu (nombre de sommets)"
+        ) from None
+    count = 1
+    for count, line in enumerate(lines, start=2):
+        digest.update(line.encode())
+        if count <= 2 * N + 1 and len(line.split()) != N:
+            raise ValueError(
+                f"Instance invalide : ligne {count}, {N} valeurs attendues"
+            )
+    if N < 1 or count < 2 * N + 1:
+        raise ValueError(f"Instance invalide : {2 * N} lignes de coûts attendues")
+
+
+def _read_instance(request):
+
+    # Renvoie l'empreinte et la source (chemin, texte) de l'instance ; le
+    # texte n'est conservé que pour une instance transmise directement
+    digest = hashlib.sha256()
+    if "path" in request:
+        with open(request["path"]) as f:
+            _check_instance(f, digest)
+        return digest.hexdigest(), (request["path"], None)
+
+    _check_instance(io.StringIO(request["data"]), digest)
+    return digest.hexdigest(), (None, request["data"])
+
+
+def _parse(key, path, text):
+
+    if text is None:
+        text = Path(path).read_text()
+        if hashlib.sha256(text.encode()).hexdigest() != key:
+            raise ValueError(f"Instance modifiée depuis son enregistrement : {path}")
+
+    return parse_data(text)
+
+
+def _worker(tasks, results, cancel, cache_size):
+
+    cache = OrderedDict()
+
+    while (task := tasks.get()) is not None:
+        _run(task, cache, cache_size, results, cancel)
+
+
+def _run(task, cache, cache_size, results, cancel):
+
+    seq, job, key, source, method, budget, seed = task
+    start = time.time()
+
+    def callback(sol):
+        results.put(("incumbent", seq, job, _solution(sol), time.time() - start))
+
+    def stop():
+        return cancel.value == seq
+
+    try:
+        if source is not None:
+            cache[key] = _parse(key, *source)
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+        cache.move_to_end(key)
+        random.seed(seed)
+        sol = METHODS[method](cache[key], budget, callback, stop)
+    except Exception as e:
+        results.put(("error", seq, job, f"{type(e).__name__}: {e}", list(cache)))
+    else:
+        elapsed = time.time() - start
+        results.put(("done", seq, job, _solution(sol), elapsed, stop(), list(cache)))
+
+
+class SolveService:
+    """Serveur de résolution avec un pool de `workers` processus.
+
+    Les instances enregistrées sont conservées côté serveur (chemin du
+    fichier, ou texte dans la limite de `memory` caractères au total,
+    l'instance la plus récente étant toujours gardée) et dans chaque worker
+    (au plus `cache_size`).
+    """
+
+    def __init__(self, workers=None, cache_size=8, memory=1 << 30):
+        self.n_workers = workers or multiprocessing.cpu_count()
+        self.cache_size = cache_size
+        self.memory = memory
+        self.instances = OrderedDict()
+        self.instances_size = 0
+        self.jobs = {}
+        self.seq = itertools.count(1)
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """Démarre les workers puis le serveur (TCP, ou Unix si `path`)."""
+        self.ctx = multiprocessing.get_context("spawn")
+        self.results = self.ctx.Queue()
+        self.workers = [None] * self.n_workers
+        for w in range(self.n_workers):
+            self._spawn(w)
+
+        self.pending = asyncio.PriorityQueue()
+        self.idle = asyncio.Queue()
+        for w in range(self.n_workers):
+            self.idle.put_nowait(w)
+        self.tasks = [
+            asyncio.create_task(self._dispatch()),
+            asyncio.create_task(self._collect()),
+            asyncio.create_task(self._watch()),
+        ]
+
+        if path is not None:
+            self.server = await asyncio.start_unix_server(
+                self._handle, path, limit=LIMIT
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self._handle, host, port, limit=LIMIT
+            )
+
+        return self.server
+
+    def _spawn(self, w):
+
+        tasks = self.ctx.Queue()
+        cancel = self.ctx.Value("q", 0, lock=False)
+        process = self.ctx.Process(
+            target=_worker,
+            args=(tasks, self.results, cancel, self.cache_size),
+            daemon=True,
+        )
+        process.start()
+        self.workers[w] = {
+            "process": process,
+            "tasks": tasks,
+            "cancel": cancel,
+            # Empreintes des instances présentes dans le cache du worker
+            "cached": set(),
+            # Travail en cours d'exécution
+            "job": None,
+        }
+
+    async def close(self):
+        """Arrête le serveur, annule les travaux et termine les workers."""
+        self.server.close()
+        for job in list(self.jobs):
+            await self._cancel(job)
+        for task in self.tasks:
+            task.cancel()
+        for worker in self.workers:
+            worker["tasks"].put(None)
+        # Débloque la lecture des résultats
+        self.results.put(None)
+        for worker in self.workers:
+            await asyncio.to_thread(worker["process"].join, 5)
+            if worker["process"].is_alive():
+                worker["process"].terminate()
+
+    # Connexions clientes
+
+    async def _handle(self, reader, writer):
+
+        lock = asyncio.Lock()
+        owned = set()
+
+        async def send(event):
+            async with lock:
+                writer.write((json.dumps(event) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                request = {}
+                try:
+                    request = json.loads(line)
+                    op = request["op"]
+                    if op == "load":
+                        await send(await self._load(request))
+                    elif op == "solve":
+                        await self._submit(request, send)
+                        owned.add(request["id"])
+                    elif op == "cancel":
+                        await self._cancel(request["id"])
+                    else:
+                        raise ValueError(f"Opération inconnue : {op!r}")
+                except (ValueError, TypeError, KeyError, OSError) as e:
+                    await send(
+                        {
+                            "event": "error",
+                            "id": request.get("id"),
+                            "message": str(e),
+                        }
+                    )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # Les travaux d'un client déconnecté sont annulés
+            for job in owned:
+                if job in self.jobs:
+                    self.jobs[job]["send"] = None
+                    await self._cancel(job)
+            writer.close()
+
+    async def _load(self, request):
+
+        # Lecture et vérification en O(N²) : hors de la boucle d'événements
+        key, source = await asyncio.to_thread(_read_instance, request)
+
+        old = self.instances.pop(key, None)
+        if old is not None and old[1] is not None:
+            self.instances_size -= len(old[1])
+        self.instances[key] = source
+        if source[1] is not None:
+            self.instances_size += len(source[1])
+
+        # Seuls les textes occupent de la place : on oublie les plus anciens
+        for other in list(self.instances):
+            if self.instances_size <= self.memory:
+                break
+            text = self.instances[other][1]
+            if other != key and text is not None:
+                del self.instances[other]
+                self.instances_size -= len(text)
+
+        return {"event": "loaded", "id": request["id"], "instance": key}
+
+    async def _submit(self, request, send):
+
+        job = request["id"]
+        key = request["instance"]
+        method = request.get("method", "local_search")
+        if job in self.jobs:
+            raise ValueError(f"Identifiant déjà utilisé : {job!r}")
+        if key not in self.instances:
+            raise ValueError(f"Instance inconnue : {key!r}")
+        self.instances.move_to_end(key)
+        if method not in METHODS:
+            raise ValueError(f"Méthode inconnue : {method!r}")
+
+        budget = float(request.get("budget", 30))
+        priority = int(request.get("priority", 0))
+        seed = request.get("seed")
+        if not budget > 0:
+            raise ValueError(f"La durée doit être positive : {budget!r}")
+        if seed is not None and not isinstance(seed, (int, float, str)):
+            raise ValueError(f"Graine invalide : {seed!r}")
+
+        seq = next(self.seq)
+        self.jobs[job] = {
+            "seq": seq,
+            "send": send,
+            "instance": key,
+            "method": method,
+            "budget": budget,
+            "seed": seed,
+            "worker": None,
+            "cancelled": False,
+        }
+        await send({"event": "queued", "id": job})
+        self.pending.put_nowait((-priority, seq, job))
+
+    async def _cancel(self, job):
+
+        info = self.jobs.get(job)
+        if info is None or info["cancelled"]:
+            return
+        info["cancelled"] = True
+        if info["worker"] is not None:
+            # Le worker s'arrêtera à la fin de son itération courante
+            self.workers[info["worker"]]["cancel"].value = info["seq"]
+        else:
+            # Le travail reste dans la file et sera ignoré par `_dispatch`
+            del self.jobs[job]
+            await self._notify(info, {"event": "done", "id": job, "cancelled": True})
+
+    async def _notify(self, info, event):
+
+        if info["send"] is not None:
+            try:
+                await info["send"](event)
+            except ConnectionError:
+                info["send"] = None
+
+    # Répartition des travaux
+
+    async def _dispatch(self):
+
+        while True:
+            # On attend un worker libre avant de choisir le travail, pour
+            # servir le plus prioritaire au moment où il se libère
+            w = await self.idle.get()
+            while True:
+                _, _, job = await self.pending.get()
+                info = self.jobs.get(job)
+                if info is not None and not info["cancelled"]:
+                    break
+
+            worker = self.workers[w]
+            cached = worker["cached"]
+            key = info["instance"]
+            source = None
+            if key not in cached:
+                source = self.instances.get(key)
+                if source is None:
+                    del self.jobs[job]
+                    self.idle.put_nowait(w)
+                    await self._notify(
+                        info,
+                        {"event": "error", "id": job, "message": "Instance oubliée"},
+                    )
+                    continue
+
+            info["worker"] = w
+            worker["job"] = job
+            worker["tasks"].put(
+                (
+                    info["seq"],
+                    job,
+                    key,
+                    source,
+                    info["method"],
+                    info["budget"],
+                    info["seed"],
+                )
+            )
+            await self._notify(info, {"event": "started", "id": job})
+
+    async def _collect(self):
+
+        while (message := await asyncio.to_thread(self.results.get)) is not None:
+            kind, seq, job = message[:3]
+            info = self.jobs.get(job)
+            # Travail déjà terminé (par exemple, worker relancé entre-temps)
+            if info is None or info["seq"] != seq:
+                continue
+
+            if kind == "incumbent":
+                _, _, _, sol, elapsed = message
+                event = {"event": "incumbent", "id": job, "elapsed": elapsed, **sol}
+                await self._notify(info, event)
+                continue
+
+            del self.jobs[job]
+            worker = self.workers[info["worker"]]
+            worker["job"] = None
+            worker["cached"] = set(message[-1])
+            self.idle.put_nowait(info["worker"])
+            if kind == "done":
+                _, _, _, sol, elapsed, cancelled, _ = message
+                event = {
+                    "event": "done",
+                    "id": job,
+                    "cancelled": cancelled,
+                    "elapsed": elapsed,
+                    **sol,
+                }
+            else:
+                event = {"event": "error", "id": job, "message": message[3]}
+            await self._notify(info, event)
+
+    async def _watch(self):
+
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            for w, worker in enumerate(self.workers):
+                if worker["process"].is_alive():
+                    continue
+                exitcode = worker["process"].exitcode
+                job = worker["job"]
+                self._spawn(w)
+                if job is None:
+                    # Worker libre : il est déjà dans la file `idle`
+                    continue
+                self.idle.put_nowait(w)
+                info = self.jobs.pop(job, None)
+                if info is not None:
+                    message = f"Worker interrompu (code de sortie {exitcode})"
+                    await self._notify(
+                        info, {"event": "error", "id": job, "message": message}
+                    )
+
+
+class SolveClient:
+    """Client asyncio du service de résolution.
+
+    Exemple :
+
+        client = await SolveClient.connect()
+        key = await client.load("instances/data1.dat")
+        async for event in client.solve(key, budget=5):
+            print(event["event"], event.get("cost"))
+        await client.close()
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.streams = {}
+        self.listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LIMIT)
+        return cls(reader, writer)
+
+    async def close(self):
+        self.listener.cancel()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def _listen(self):
+
+        while line := await self.reader.readline():
+            event = json.loads(line)
+            stream = self.streams.get(event.get("id"))
+            if stream is not None:
+                stream.put_nowait(event)
+        for stream in self.streams.values():
+            stream.put_nowait({"event": "error", "message": "Connexion perdue"})
+
+    async def _send(self, request):
+
+        self.writer.write((json.dumps(request) + "\n").encode())
+        await self.writer.drain()
+
+    async def load(self, name=None, data=None):
+        """Enregistre une instance (fichier ou contenu) et renvoie son empreinte."""
+        request = {"op": "load", "id": uuid.uuid4().hex}
+        if name is not None:
+            request["path"] = str(Path(name).resolve())
+        else:
+            request["data"] = data
+
+        stream = self.streams[request["id"]] = asyncio.Queue()
+        try:
+            await self._send(request)
+            event = await stream.get()
+        finally:
+            del self.streams[request["id"]]
+        if event["event"] == "error":
+            raise RuntimeError(event["message"])
+
+        return event["instance"]
+
+    async def solve(
+        self,
+        instance,
+        method="local_search",
+        budget=30,
+        priority=0,
+        seed=None,
+        job=None,
+    ):
+        """Soumet une résolution et renvoie les événements jusqu'à "done".
+
+        Le dernier événement ("done" ou "error") contient la solution finale
+        ou le message d'erreur.
+        """
+        job = job or uuid.uuid4().hex
+        stream = self.streams[job] = asyncio.Queue()
+        try:
+            await self._send(
+                {
+                    "op": "solve",
+                    "id": job,
+                    "instance": instance,
+                    "method": method,
+                    "budget": budget,
+                    "priority": priority,
+                    "seed": seed,
+                }
+            )
+            while True:
+                event = await stream.get()
+                yield event
+                if event["event"] in ("done", "error"):
+                    break
+        finally:
+            del self.streams[job]
+
+    async def cancel(self, job):
+        """Annule la résolution `job` (en attente ou en cours)."""
+        await self._send({"op": "cancel", "id": job})
+
+
+def main(argv=None):
+    """Lance le service de résolution jusqu'à son interruption."""
+    parser = argparse.ArgumentParser(
+        prog="ring-star-service",
+        description="Service local de résolution du Ring Star Problem.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8765)
+    parser.add_argument("-u", "--unix", help="chemin d'une socket Unix")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-c", "--cache-size", type=int, default=8)
+    parser.add_argument(
+        "-m",
+        "--memory",
+        type=int,
+        default=1024,
+        help="taille maximale des instances conservées par le serveur (Mo)",
+    )
+    args = parser.parse_args(argv)
+
+    async def serve():
+        service = SolveService(args.workers, args.cache_size, args.memory << 20)
+        server = await service.start(args.host, args.port, args.unix)
+        print(f"Service prêt : {args.unix or f'{args.host}:{args.port}'}")
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
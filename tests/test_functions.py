@@ -0,0 +1,82 @@
+"""Tests du stockage compact des matrices de coûts (module `functions`)."""
+
+import random
+
+import pytest
+
+from ring_star.functions import (
+    BestNeighbor,
+    CalculCost,
+    CompactMatrix,
+    CostGetter,
+    InitSol,
+    NarrowType,
+    TabuNeighbors,
+)
+from ring_star.generator import generate_instance
+
+
+def test_narrow_type():
+    assert NarrowType(0, 255) == "B"
+    assert NarrowType(0, 256) == "H"
+    assert NarrowType(-1, 127) == "b"
+    assert NarrowType(5, 5) == "B"
+    with pytest.raises(OverflowError):
+        NarrowType(-1, 1 << 63)
+
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_compact_matrix_keeps_every_cost(symmetric):
+    rng = random.Random(0)
+    N = 12
+    rows = [[rng.randint(0, 1000) for _ in range(N)] for _ in range(N)]
+    if symmetric:
+        for i in range(N):
+            for j in range(i):
+                rows[i][j] = rows[j][i]
+
+    mat = CompactMatrix(rows)
+    get = CostGetter(mat)
+    assert len(mat) == N + 1
+    assert len(mat[-1]) == N + 1
+    assert (len(mat[1]) == 2) == symmetric
+    for a in range(1, N + 1):
+        for b in range(1, N + 1):
+            assert get(a, b) == rows[a - 1][b - 1]
+
+
+def _asymmetric(data, seed=0):
+
+    # mat1[a][b] + p(a) - p(b) : le coût de tout cycle est inchangé, mais la
+    # matrice n'est plus symétrique (les lectures orientées comptent)
+    rng = random.Random(seed)
+    N = data[0]
+    get = CostGetter(data[1])
+    p = [0] + [rng.randint(0, 500) for _ in range(N)]
+    rows = [
+        [get(a, b) + p[a] - p[b] + 500 for b in range(1, N + 1)]
+        for a in range(1, N + 1)
+    ]
+    return [N, CompactMatrix(rows), data[2]]
+
+
+# Le Déplacement lit deux des arêtes modifiées dans des sens opposés : son
+# coût incrémental n'est exact que pour une matrice du Ring symétrique
+@pytest.mark.parametrize(
+    "choice, symmetric",
+    [(1, True), (2, True), (3, True), (1, False), (2, False)],
+)
+def test_neighborhood_costs_match_full_evaluation(choice, symmetric):
+    data = generate_instance(25, "uniform", seed=3)
+    if not symmetric:
+        data = _asymmetric(data)
+        assert len(data[1][1]) == data[0] + 1
+    random.seed(0)
+    for _ in range(10):
+        sol = InitSol(data)
+        if len(sol[0]) <= 3:
+            continue
+        for neighbor in TabuNeighbors(data, sol, choice):
+            assert neighbor[2] == CalculCost(data, neighbor)
+        sol = BestNeighbor(data, sol, choice)
+        assert sol[2] == CalculCost(data, sol)
@@ -0,0 +1,99 @@
+"""Tests du hachage de Zobrist des solutions (module `hashing`)."""
+
+import random
+
+import pytest
+
+from ring_star.functions import BestNeighbor, InitSol, TabuNeighbors
+from ring_star.generator import generate_instance
+from ring_star.hashing import (
+    HashSol,
+    MemberHash,
+    MoveHash,
+    RingHash,
+    SolKey,
+    SwapHash,
+    VisitedCache,
+)
+
+
+@pytest.fixture(scope="module")
+def data():
+    return generate_instance(30, "clustered", seed=1)
+
+
+def _solutions(data, count, seed=0):
+
+    random.seed(seed)
+    sols = []
+    while len(sols) < count:
+        sol = InitSol(data)
+        if len(sol[0]) > 3:
+            sols.append(HashSol(sol))
+    return sols
+
+
+def test_ring_hash_is_rotation_and_direction_invariant():
+    ring = [4, 9, 1, 7, 3, 12]
+    h = RingHash(ring)
+    for k in range(len(ring)):
+        rotated = ring[k:] + ring[:k]
+        assert RingHash(rotated) == h
+        assert RingHash(rotated[::-1]) == h
+    assert RingHash([4, 1, 9, 7, 3, 12]) != h
+
+
+def test_member_hash_ignores_order():
+    assert MemberHash([3, 1, 2]) == MemberHash([1, 2, 3])
+    assert MemberHash([1, 2, 3]) != MemberHash([1, 2, 4])
+
+
+@pytest.mark.parametrize("n", [3, 4, 5, 9])
+def test_swap_and_move_hash_match_full_recomputation(n):
+    ring = list(range(1, n + 1))
+    h = RingHash(ring)
+    for i in range(n):
+        for j in range(n):
+            swapped = ring.copy()
+            swapped[i], swapped[j] = swapped[j], swapped[i]
+            assert SwapHash(ring, h, i, j) == RingHash(swapped)
+
+            moved = ring.copy()
+            moved.insert(j, moved.pop(i))
+            assert MoveHash(ring, h, i, j) == RingHash(moved)
+
+
+@pytest.mark.parametrize("choice", [1, 2, 3])
+def test_best_neighbor_keeps_hash_up_to_date(data, choice):
+    for sol in _solutions(data, 10):
+        members = sol[4]
+        for _ in range(5):
+            sol = BestNeighbor(data, sol, choice)
+            assert sol[3] == RingHash(sol[0])
+            assert sol[4] == members == MemberHash(sol[0])
+            assert len(set(sol[0])) == len(sol[0])
+
+
+@pytest.mark.parametrize("choice", [1, 2, 3])
+def test_tabu_neighbors_carry_exact_hash(data, choice):
+    for sol in _solutions(data, 3):
+        for neighbor in TabuNeighbors(data, sol, choice):
+            assert neighbor[3] == RingHash(neighbor[0])
+            assert neighbor[4] == sol[4]
+
+
+def test_sol_key_identifies_same_cycle():
+    sol = HashSol([[1, 2, 3, 4], [(5, 1)], 10])
+    other = HashSol([[3, 2, 1, 4], [(5, 1)], 10])
+    assert SolKey(sol) == SolKey(other)
+
+
+def test_visited_cache_is_bounded_lru():
+    cache = VisitedCache(maxsize=2)
+    cache.add("a")
+    cache.add("b")
+    assert "a" in cache  # "a" devient le plus récent
+    cache.add("c")
+    assert len(cache) == 2
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
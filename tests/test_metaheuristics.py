@@ -0,0 +1,45 @@
+"""Tests des métaheuristiques (module `metaheuristics`)."""
+
+import copy
+import random
+
+from ring_star.functions import InitSol
+from ring_star.generator import generate_instance
+from ring_star.hashing import HashSol, SolKey, VisitedCache
+from ring_star.metaheuristics import LocalSearch
+
+
+def _counter():
+
+    calls = []
+
+    def stop():
+        calls.append(None)
+        return False
+
+    return stop, calls
+
+
+def test_local_search_stops_on_known_optimum():
+    data = generate_instance(40, "uniform", seed=2)
+    random.seed(4)
+    start = HashSol(InitSol(data, size=20))
+
+    # Première descente : l'optimum atteint est mémorisé
+    visited = VisitedCache()
+    stop, full = _counter()
+    random.seed(0)
+    optimum = LocalSearch(data, copy.deepcopy(start), visited, stop)
+    assert optimum[2] < start[2]
+    assert SolKey(optimum) in visited
+
+    # Même descente, l'optimum étant déjà connu : arrêt dès qu'il est rejoint
+    known = VisitedCache()
+    known.add(SolKey(optimum))
+    stop, short = _counter()
+    random.seed(0)
+    sol = LocalSearch(data, copy.deepcopy(start), known, stop)
+    assert sol[2] == optimum[2]
+    assert SolKey(sol) == SolKey(optimum)
+    # La première descente a poursuivi 100 itérations sans amélioration
+    assert len(short) + 100 == len(full)
@@ -0,0 +1,238 @@
+"""Tests du service local de résolution (module `service`)."""
+
+import asyncio
+import queue
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from ring_star.functions import CalculCost, load_data
+from ring_star.service import SolveClient, SolveService, _run
+
+INSTANCES = Path(__file__).resolve().parents[1] / "instances"
+INSTANCE = INSTANCES / "data1.dat"
+
+
+def _serve(scenario, workers=1, **options):
+
+    async def run():
+        service = SolveService(workers=workers, **options)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        client = await SolveClient.connect(port=port)
+        try:
+            return await asyncio.wait_for(scenario(service, client), 60)
+        finally:
+            await client.close()
+            await service.close()
+
+    return asyncio.run(run())
+
+
+async def _collect(stream):
+
+    return [event async for event in stream]
+
+
+async def _queued(stream):
+
+    assert (await anext(stream))["event"] == "queued"
+    return stream
+
+
+def test_load_solve_done():
+    async def scenario(service, client):
+        key = await client.load(INSTANCE)
+        return await _collect(client.solve(key, budget=0.5, seed=1))
+
+    events = _serve(scenario)
+    kinds = [event["event"] for event in events]
+    assert kinds[:2] == ["queued", "started"]
+    assert kinds[-1] == "done"
+    assert set(kinds[2:-1]) <= {"incumbent"}
+
+    done = events[-1]
+    assert not done["cancelled"]
+    data = load_data(INSTANCE)
+    sol = [done["ring"], [tuple(s) for s in done["star"]], done["cost"]]
+    assert CalculCost(data, sol) == done["cost"]
+    assert sorted(done["ring"] + [s[0] for s in done["star"]]) == list(
+        range(1, data[0] + 1)
+    )
+
+
+def test_priority_order():
+    async def scenario(service, client):
+        key = await client.load(INSTANCE)
+        order = []
+
+        async def run(job, **kwargs):
+            async for event in client.solve(key, job=job, **kwargs):
+                if event["event"] == "started":
+                    order.append(job)
+
+        blocker = asyncio.create_task(run("blocker", budget=1))
+        await asyncio.sleep(0.2)
+        await asyncio.gather(
+            run("low", budget=0.2, priority=0),
+            run("high", budget=0.2, priority=5),
+            blocker,
+        )
+        return order
+
+    assert _serve(scenario) == ["blocker", "high", "low"]
+
+
+def test_cancel_pending_and_running():
+    async def scenario(service, client):
+        key = await client.load(INSTANCE)
+        running = client.solve(key, job="running", budget=60)
+        assert (await anext(running))["event"] == "queued"
+        assert (await anext(running))["event"] == "started"
+
+        pending = await _queued(client.solve(key, job="pending", budget=60))
+        await client.cancel("pending")
+        pending_events = [event async for event in pending]
+
+        await asyncio.sleep(0.2)
+        await client.cancel("running")
+        running_events = await asyncio.wait_for(_collect(running), 5)
+        return pending_events, running_events
+
+    pending_events, running_events = _serve(scenario)
+    assert pending_events[-1]["event"] == "done"
+    assert pending_events[-1]["cancelled"]
+    assert "cost" not in pending_events[-1]
+    assert "started" not in [event["event"] for event in pending_events]
+
+    assert running_events[-1]["event"] == "done"
+    assert running_events[-1]["cancelled"]
+    assert running_events[-1]["elapsed"] < 5
+    assert "cost" in running_events[-1]
+
+
+def test_malformed_instance_is_rejected():
+    async def scenario(service, client):
+        with pytest.raises(RuntimeError) as error:
+            await client.load(data="not an instance\n")
+        key = await client.load(INSTANCE)
+        events = await _collect(client.solve(key, budget=0.2))
+        return str(error.value), events
+
+    error, events = _serve(scenario)
+    assert "Instance invalide" in error
+    assert events[-1]["event"] == "done"
+
+
+def test_unparsable_instance_reports_error_and_keeps_worker():
+    # En-tête et nombre de valeurs corrects, mais valeurs non entières
+    text = "2\n0 x\nx 0\n0 1\n1 0\n"
+
+    async def scenario(service, client):
+        bad = await client.load(data=text)
+        bad_events = await _collect(client.solve(bad, budget=0.2))
+        key = await client.load(INSTANCE)
+        events = await _collect(client.solve(key, budget=0.2))
+        return bad_events, events
+
+    bad_events, events = _serve(scenario)
+    assert bad_events[-1]["event"] == "error"
+    assert "ValueError" in bad_events[-1]["message"]
+    assert events[-1]["event"] == "done"
+
+
+def test_dead_worker_is_replaced():
+    async def scenario(service, client):
+        key = await client.load(INSTANCE)
+        stream = client.solve(key, budget=60)
+        assert (await anext(stream))["event"] == "queued"
+        assert (await anext(stream))["event"] == "started"
+        service.workers[0]["process"].kill()
+        killed = await _collect(stream)
+        events = await _collect(client.solve(key, budget=0.2))
+        return killed, events
+
+    killed, events = _serve(scenario)
+    assert killed[-1]["event"] == "error"
+    assert "Worker interrompu" in killed[-1]["message"]
+    assert events[-1]["event"] == "done"
+
+
+@pytest.mark.parametrize("options", [{"budget": 0}, {"seed": [1]}, {"seed": {"a": 1}}])
+def test_invalid_options_are_rejected(options):
+    async def scenario(service, client):
+        key = await client.load(INSTANCE)
+        return await _collect(client.solve(key, **options))
+
+    events = _serve(scenario)
+    assert [event["event"] for event in events] == ["error"]
+
+
+def test_worker_cache_stays_in_sync_after_errors():
+    async def scenario(service, client):
+        a, b, c = [await client.load(INSTANCES / f"data{i}.dat") for i in (1, 2, 3)]
+        events = {}
+        for name, key, seed in (
+            ("a", a, None),
+            ("b", b, None),
+            ("b-bad", b, [1]),
+            ("c", c, None),
+            ("a-again", a, None),
+        ):
+            stream = client.solve(key, budget=0.2, seed=seed)
+            events[name] = await _collect(stream)
+        return events
+
+    events = _serve(scenario, cache_size=2)
+    assert [event["event"] for event in events["b-bad"]] == ["error"]
+    for name in ("a", "b", "c", "a-again"):
+        assert events[name][-1]["event"] == "done", events[name][-1]
+
+
+def test_worker_reports_cached_instance_on_error():
+    results = queue.Queue()
+    cache = OrderedDict()
+    text = INSTANCE.read_text()
+    # Graine invalide : l'instance est déjà analysée et mise en cache
+    task = (1, "job", "key", (None, text), "local_search", 0.1, [1])
+    _run(task, cache, 2, results, SimpleNamespace(value=0))
+    message = results.get_nowait()
+    assert message[0] == "error"
+    assert message[-1] == ["key"]
+
+
+def test_server_texts_are_bounded_by_size():
+    text = INSTANCE.read_text()
+
+    async def scenario(service, client):
+        path = await client.load(INSTANCES / "data3.dat")
+        a = await client.load(data=text)
+        b = await client.load(data=(INSTANCES / "data2.dat").read_text())
+        events = await _collect(client.solve(a, budget=0.2))
+        return events, list(service.instances) == [path, b]
+
+    events, kept = _serve(scenario, memory=len(text) * 3 // 2)
+    assert events[-1]["event"] == "error"
+    assert "Instance inconnue" in events[-1]["message"]
+    assert kept
+
+
+def test_file_is_reread_and_checked_by_workers(tmp_path):
+    path = tmp_path / "instance.dat"
+    path.write_text(INSTANCE.read_text())
+
+    async def scenario(service, client):
+        key = await client.load(path)
+        events = await _collect(client.solve(key, budget=0.2))
+        # Fichier modifié avant qu'un autre worker ne le relise
+        path.write_text((INSTANCES / "data2.dat").read_text())
+        service.workers[0]["cached"].clear()
+        changed = await _collect(client.solve(key, budget=0.2))
+        return events, changed
+
+    events, changed = _serve(scenario)
+    assert events[-1]["event"] == "done"
+    assert changed[-1]["event"] == "error"
+    assert "Instance modifiée" in changed[-1]["message"]